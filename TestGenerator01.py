@@ -3,15 +3,10 @@ import os
 import sys
 import logging
 import subprocess
-import requests
 import json
 import time
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s [%(levelname)s] %(message)s",
-    handlers=[logging.StreamHandler(sys.stdout)]
-)
+from scheduler import Scheduler, ORDERS, estimate_tokens
 
 # =============================================================================
 # Globale Einstellungen
@@ -54,6 +49,21 @@ def get_api_key():
     return api_key
 
 
+def get_optional_number(name, number_type):
+    """
+    Liest eine optionale Zahl (z.B. TOKEN_BUDGET oder TIME_BUDGET) aus der gleichnamigen Umgebungsvariable.
+    Gibt None zurück, wenn die Variable nicht gesetzt ist.
+    """
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        return number_type(value)
+    except ValueError:
+        logging.error("Ungültiger Wert für %s: %s", name, value)
+        sys.exit(1)
+
+
 def prompt_for_class_name():
     """
     Fragt den Nutzer nach dem Namen einer Java-Klasse.
@@ -105,6 +115,9 @@ def call_llm(api_key, prompt_text):
 
     Timeout = 30 Sekunden
     """
+    # Erst bei Bedarf importieren, damit der Import des Moduls schnell und ohne Seiteneffekte bleibt
+    import requests
+
     url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={api_key}"
     headers = {
         "Content-Type": "application/json"
@@ -313,6 +326,12 @@ def create_prompt_for_fix(compile_error_msg, current_test_code):
 # =============================================================================
 
 def main():
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)]
+    )
+
     project_dir = get_project_dir()
     api_key = get_api_key()
 
@@ -332,8 +351,25 @@ def main():
         logging.info("Keine Java-Dateien gefunden.")
         sys.exit(0)
 
+    # Reihenfolge nach Priorität (fehlende Tests, Änderungen, Churn) pro Token bestimmen
+    schedule_order = os.environ.get("SCHEDULE_ORDER") or "priority"
+    if schedule_order not in ORDERS:
+        logging.error("Ungültiger Wert für SCHEDULE_ORDER: %s (erlaubt: %s)", schedule_order, ", ".join(ORDERS))
+        sys.exit(1)
+    scheduler = Scheduler(order=schedule_order,
+                          token_budget=get_optional_number("TOKEN_BUDGET", int),
+                          test_dir=os.path.join(project_dir, TEST_SRC_DIR),
+                          prompt_tokens=estimate_tokens(len(create_prompt_for_test_generation("").encode("utf-8"))))
+    java_files = scheduler.schedule(java_files)
+    time_budget = get_optional_number("TIME_BUDGET", float)
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+
     # Wir verarbeiten jede gefundene Java-Datei
-    for java_file in java_files:
+    for index, java_file in enumerate(java_files):
+        if deadline is not None and time.monotonic() > deadline:
+            logging.info("Zeitbudget aufgebraucht, %s Klassen werden übersprungen.", len(java_files) - index)
+            break
+
         # Schritt 1: Quelle lesen
         logging.info("Lese Java-Klasse: %s", java_file)
         source_code = read_file_content(java_file)
@@ -1,18 +1,29 @@
 import os
 import json
 import time
-from openai import OpenAI
 
-# API-Schlüssel über Umgebungsvariablen einlesen
-api_key = os.getenv("API_KEY")
-if not api_key:
-    raise ValueError("Umgebungsvariable 'API_KEY' ist nicht gesetzt.")
+_client = None
 
-# OpenAI-Client initialisieren
-client = OpenAI(
-    api_key=api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+def get_client():
+    """
+    Erstellt den OpenAI-Client beim ersten Aufruf und gibt ihn danach wieder zurück.
+    Dadurch hat der Import des Moduls keine Seiteneffekte und bleibt schnell.
+    """
+    global _client
+    if _client is None:
+        from openai import OpenAI
+
+        # API-Schlüssel über Umgebungsvariablen einlesen
+        api_key = os.getenv("API_KEY")
+        if not api_key:
+            raise ValueError("Umgebungsvariable 'API_KEY' ist nicht gesetzt.")
+
+        # OpenAI-Client initialisieren
+        _client = OpenAI(
+            api_key=api_key,
+            base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
+        )
+    return _client
 
 def log_to_stdout(message_type, content):
     """
@@ -26,7 +37,7 @@ def send_request_to_llm(prompt):
     """
     log_to_stdout("REQUEST", prompt)
     time.sleep(5)  # Warten Sie 5 Sekunden, bevor die Anfrage gesendet wird
-    response = client.chat.completions.create(
+    response = get_client().chat.completions.create(
         model="gemini-1.5-flash",
         n=1,
         messages=[
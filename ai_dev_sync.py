@@ -1,41 +1,68 @@
 import os
 import json
+import heapq
+import argparse
 import logging
-import requests
 import itertools
 import time
+import hashlib
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict
-from threading import Thread
-import tkinter as tk
-from tkinter.scrolledtext import ScrolledText
+from typing import List, Dict, Optional
+from threading import Thread, Condition, Event, Lock
+from scheduler import Scheduler, ORDERS, estimate_tokens
 
-API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent"
+API_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+MODEL = "gemini-1.5-flash"
+API_URL = f"{API_BASE_URL}/models/{MODEL}:generateContent"
+# cachedContents only works with pinned model versions, and generateContent must use the same model
+CACHE_MODEL = "gemini-1.5-flash-001"
+CACHED_API_URL = f"{API_BASE_URL}/models/{CACHE_MODEL}:generateContent"
+CACHE_TTL_SECONDS = 600
+CACHE_REFRESH_MARGIN_SECONDS = 120
+CACHE_MIN_TOKENS = 32768  # Smallest prefix the server accepts for cachedContents
+CACHE_DISPLAY_NAME_PREFIX = "ai_dev_sync-"
+REQUEST_INTERVAL_SECONDS = 4
+REQUEST_TIMEOUT_SECONDS = 120
+
+#DEFAULT_BASE_DIRECTORY = Path("/home/andre/IdeaProjects/algosec-portal")
+DEFAULT_BASE_DIRECTORY = Path("/home/andre/IdeaProjects/algosec-connector/src/main/java/fwat/application/security/logging")
+DEFAULT_PATTERNS = ["*.java", "*.conf", "*.properties", "*.yml"]
+
+def _requests():
+    """Imports requests on first use so headless runs and plain imports of this module stay fast."""
+    import requests
+    return requests
 
 class APIClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
 
-    def send_prompt(self, prompt: str) -> Dict:
+    def send_prompt(self, prompt: str, cached_content: Optional[str] = None) -> Dict:
         headers = {'Content-Type': 'application/json'}
         payload = {
             "contents": [{
                 "parts": [{"text": prompt}]
             }]
         }
+        if cached_content:
+            payload["cachedContent"] = cached_content
         logging.info(f"Sending API request with payload: {json.dumps(payload)}")
         logging.info(f"RAW REQUEST: {json.dumps(payload)}")
         response_container = {}
         progress_thread = Thread(target=self._show_progress, args=(response_container,))
         progress_thread.start()
         try:
-            response = requests.post(f"{API_URL}?key={self.api_key}", headers=headers, json=payload)
+            url = CACHED_API_URL if cached_content else API_URL
+            response = _requests().post(f"{url}?key={self.api_key}", headers=headers, json=payload,
+                                        timeout=REQUEST_TIMEOUT_SECONDS)
             response.raise_for_status()
-            response_container['done'] = True
             logging.info(f"Received API response: {response.text}")
             logging.info(f"RAW RESPONSE: {response.text}")
             return response.json()
         finally:
+            # Also stop the progress thread on errors, otherwise join() would wait forever
+            response_container['done'] = True
             progress_thread.join()
 
     def _show_progress(self, response_container):
@@ -44,6 +71,146 @@ class APIClient:
             logging.info(f"Waiting for API response {next(dots)}")
             time.sleep(0.5)
 
+class ContextCacheManager:
+    """
+    Manages Gemini cachedContents for prompt prefixes that are shared by many requests.
+    Caches are keyed by the SHA-256 hash of the prefix, so the same base prompt is only
+    uploaded once and can be reused until its TTL expires. Prefixes below the minimum
+    cacheable size or refused by the server are remembered and sent inline instead.
+    Caches created by another process are reused but never deleted here; they expire by TTL.
+    """
+
+    def __init__(self, api_key: str, model: str = CACHE_MODEL, ttl_seconds: int = CACHE_TTL_SECONDS):
+        self.api_key = api_key
+        self.model = model
+        self.ttl_seconds = ttl_seconds
+        self._caches: Dict[str, Dict] = {}
+        self._uncacheable = set()
+
+    @staticmethod
+    def prefix_hash(prefix: str) -> str:
+        return hashlib.sha256(prefix.encode('utf-8')).hexdigest()
+
+    def get_or_create(self, prefix: str) -> Optional[str]:
+        """
+        Returns the name of a cachedContent holding the prefix, or None if it has to be sent inline.
+        """
+        prefix_hash = self.prefix_hash(prefix)
+        if prefix_hash in self._uncacheable:
+            return None
+        if estimate_tokens(len(prefix.encode('utf-8'))) < CACHE_MIN_TOKENS:
+            logging.info(f"Prefix {prefix_hash[:12]} is below the minimum cacheable size, sending it inline")
+            self._uncacheable.add(prefix_hash)
+            return None
+        try:
+            entry = self._caches.get(prefix_hash)
+            if entry is not None and entry["expires"] <= time.time():
+                # Already expired on the server, a refresh would only return 404
+                del self._caches[prefix_hash]
+                entry = None
+            if entry is None:
+                name = self._find_existing(prefix_hash)
+                if name:
+                    # The remaining TTL is unknown, so the entry is refreshed right away
+                    entry = self._caches[prefix_hash] = {"name": name, "expires": 0.0, "owned": False}
+            if entry is None:
+                self._create_or_disable(prefix)
+            elif entry["expires"] - time.time() < CACHE_REFRESH_MARGIN_SECONDS:
+                try:
+                    self.refresh(prefix_hash)
+                except _requests().exceptions.HTTPError as e:
+                    if e.response is None or e.response.status_code != 404:
+                        raise
+                    logging.info(f"Context cache {entry['name']} is gone, creating a new one")
+                    del self._caches[prefix_hash]
+                    self._create_or_disable(prefix)
+        except (_requests().exceptions.RequestException, KeyError, ValueError) as e:
+            logging.warning(f"Context caching unavailable, sending prefix inline: {e}")
+            self._caches.pop(prefix_hash, None)
+            return None
+        return self._caches[prefix_hash]["name"]
+
+    def _create_or_disable(self, prefix: str):
+        """Creates the cache; a client error (except rate limiting) disables caching for this prefix."""
+        try:
+            self.create(prefix)
+        except _requests().exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else None
+            if status is not None and 400 <= status < 500 and status != 429:
+                self._uncacheable.add(self.prefix_hash(prefix))
+            raise
+
+    def create(self, prefix: str) -> str:
+        prefix_hash = self.prefix_hash(prefix)
+        payload = {
+            "model": f"models/{self.model}",
+            "displayName": f"{CACHE_DISPLAY_NAME_PREFIX}{prefix_hash[:32]}",
+            "contents": [{
+                "role": "user",
+                "parts": [{"text": prefix}]
+            }],
+            "ttl": f"{self.ttl_seconds}s"
+        }
+        response = _requests().post(f"{API_BASE_URL}/cachedContents?key={self.api_key}",
+                                 headers={'Content-Type': 'application/json'}, json=payload, timeout=30)
+        response.raise_for_status()
+        name = response.json()["name"]
+        self._caches[prefix_hash] = {"name": name, "expires": time.time() + self.ttl_seconds, "owned": True}
+        logging.info(f"Created context cache {name} for prefix {prefix_hash[:12]}")
+        return name
+
+    def refresh(self, prefix_hash: str):
+        entry = self._caches[prefix_hash]
+        response = _requests().patch(f"{API_BASE_URL}/{entry['name']}?key={self.api_key}&updateMask=ttl",
+                                  headers={'Content-Type': 'application/json'},
+                                  json={"ttl": f"{self.ttl_seconds}s"}, timeout=30)
+        response.raise_for_status()
+        entry["expires"] = time.time() + self.ttl_seconds
+        logging.info(f"Refreshed TTL of context cache {entry['name']}")
+
+    def delete(self, prefix_hash: str):
+        entry = self._caches.pop(prefix_hash, None)
+        if entry is None:
+            return
+        try:
+            response = _requests().delete(f"{API_BASE_URL}/{entry['name']}?key={self.api_key}", timeout=30)
+            response.raise_for_status()
+            logging.info(f"Deleted context cache {entry['name']}")
+        except _requests().exceptions.RequestException as e:
+            logging.warning(f"Could not delete context cache {entry['name']}: {e}")
+
+    def delete_all(self):
+        """Deletes the caches created by this manager; reused caches may still be in use elsewhere."""
+        for prefix_hash, entry in list(self._caches.items()):
+            if entry["owned"]:
+                self.delete(prefix_hash)
+            else:
+                del self._caches[prefix_hash]
+
+    def invalidate(self, prefix: str):
+        """Forgets the cache of a prefix, e.g. after the server no longer accepts it."""
+        entry = self._caches.pop(self.prefix_hash(prefix), None)
+        if entry:
+            logging.info(f"Dropped context cache {entry['name']}")
+
+    def _find_existing(self, prefix_hash: str) -> Optional[str]:
+        display_name = f"{CACHE_DISPLAY_NAME_PREFIX}{prefix_hash[:32]}"
+        page_token = None
+        while True:
+            url = f"{API_BASE_URL}/cachedContents?key={self.api_key}&pageSize=100"
+            if page_token:
+                url += f"&pageToken={page_token}"
+            response = _requests().get(url, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            for cached in data.get("cachedContents", []):
+                if cached.get("displayName") == display_name and cached.get("model", "").endswith(self.model):
+                    logging.info(f"Reusing context cache {cached['name']} for prefix {prefix_hash[:12]}")
+                    return cached["name"]
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                return None
+
 class FileManager:
     def __init__(self, base_directory: Path):
         self.base_directory = base_directory
@@ -65,23 +232,30 @@ class PromptProcessor:
         self.file_manager = file_manager
 
     def build_prompt_for_file(self, base_prompt: str, file: Path) -> str:
-        content = self.file_manager.read_file_content(file)
-        prompt = f"{base_prompt}\n\n---\n{file}:{content}"
+        prompt = f"{base_prompt}\n\n{self.build_file_part(file)}"
         logging.info(f"Constructed prompt for file {file}: {prompt}")
         return prompt
 
+    def build_file_part(self, file: Path) -> str:
+        content = self.file_manager.read_file_content(file)
+        return f"---\n{file}:{content}"
+
 class ResponseHandler:
-    def __init__(self, file_manager: FileManager, gui=None):
+    def __init__(self, file_manager: FileManager, gui=None, collect_responses: bool = True):
         self.file_manager = file_manager
+        self.collect_responses = collect_responses
         self.collected_responses = []
         self.gui = gui
+        # Context manager factory wrapped around every file write, e.g. to hide own writes from a watcher
+        self.write_guard = None
 
     def process_response(self, response: Dict):
         candidates = response.get("candidates", [])
         for candidate in candidates:
             parts = candidate.get("content", {}).get("parts", [])
             for part in parts:
-                self.collected_responses.append(part["text"])
+                if self.collect_responses:
+                    self.collected_responses.append(part["text"])
                 self.extract_and_update_java_files(part["text"])
                 if self.gui:
                     self.gui.display_message(f"Response: {part['text']}")
@@ -119,41 +293,279 @@ class ResponseHandler:
                 else:
                     file_path = self.file_manager.base_directory / package_path / file_name
                 file_path.parent.mkdir(parents=True, exist_ok=True)
-                file_path.write_text(file_content, encoding='utf-8')
+                if self.write_guard:
+                    with self.write_guard(file_path):
+                        file_path.write_text(file_content, encoding='utf-8')
+                else:
+                    file_path.write_text(file_content, encoding='utf-8')
                 logging.info(f"Updated file: {file_path}")
 
-def process_files(base_prompt: str, gui=None):
-    api_key = os.getenv("API_KEY")
-    if not api_key:
-        raise EnvironmentError("API key is missing. Set API_KEY as an environment variable.")
+class FileProcessor:
+    """
+    Sends single files together with the base prompt to the API and applies the responses.
+    Holds the API client and the context cache so they can be reused across many files.
+    """
 
-    #base_directory = Path("/home/andre/IdeaProjects/algosec-portal")
-    base_directory = Path("/home/andre/IdeaProjects/algosec-connector/src/main/java/fwat/application/security/logging")
-    file_manager = FileManager(base_directory)
-    prompt_processor = PromptProcessor(file_manager)
-    response_handler = ResponseHandler(file_manager, gui)
-    api_client = APIClient(api_key)
+    def __init__(self, base_prompt: str, base_directory: Path, gui=None, collect_responses: bool = True):
+        api_key = os.getenv("API_KEY")
+        if not api_key:
+            raise EnvironmentError("API key is missing. Set API_KEY as an environment variable.")
 
-    patterns = ["*.java", "*.conf", "*.properties", "*.yml"]
+        self.base_prompt = base_prompt
+        self.file_manager = FileManager(base_directory)
+        self.prompt_processor = PromptProcessor(self.file_manager)
+        self.response_handler = ResponseHandler(self.file_manager, gui, collect_responses)
+        self.api_client = APIClient(api_key)
+        self.cache_manager = ContextCacheManager(api_key)
 
-    files = file_manager.find_files(patterns)
-    for file in files:
-        prompt = prompt_processor.build_prompt_for_file(base_prompt, file)
+    def process_file(self, file: Path):
         try:
-            response = api_client.send_prompt(prompt)
-            response_handler.process_response(response)
-            time.sleep(4)  # Rate limiting: Wait for 4 seconds between requests
+            # The shared base prompt is uploaded once as cached content; only the file part is sent per request
+            cached_content = self.cache_manager.get_or_create(self.base_prompt)
+            if cached_content:
+                prompt = self.prompt_processor.build_file_part(file)
+            else:
+                prompt = self.prompt_processor.build_prompt_for_file(self.base_prompt, file)
+            try:
+                response = self.api_client.send_prompt(prompt, cached_content)
+            except _requests().exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if not cached_content or status is None or not 400 <= status < 500 or status == 429:
+                    raise
+                # The cache was deleted or expired on the server; retry once with the full prompt
+                logging.warning(f"Request with context cache {cached_content} failed ({status}), retrying inline")
+                self.cache_manager.invalidate(self.base_prompt)
+                prompt = self.prompt_processor.build_prompt_for_file(self.base_prompt, file)
+                response = self.api_client.send_prompt(prompt)
+            self.response_handler.process_response(response)
+            time.sleep(REQUEST_INTERVAL_SECONDS)  # Rate limiting between requests
         except Exception as e:
             logging.error(f"Error occurred while processing file {file}: {e}")
 
-    combined_responses = "\n\n".join(response_handler.collected_responses)
+    def close(self):
+        self.cache_manager.delete_all()
+
+def process_files(base_prompt: str, gui=None, base_directory: Path = DEFAULT_BASE_DIRECTORY,
+                  patterns: List[str] = DEFAULT_PATTERNS, scheduler: Optional[Scheduler] = None,
+                  time_budget: Optional[float] = None):
+    processor = FileProcessor(base_prompt, base_directory, gui)
+    if scheduler is None:
+        scheduler = Scheduler(prompt_tokens=estimate_tokens(len(base_prompt.encode('utf-8'))))
+
+    files = scheduler.schedule(processor.file_manager.find_files(patterns))
+    deadline = time.monotonic() + time_budget if time_budget is not None else None
+    try:
+        for index, file in enumerate(files):
+            if deadline is not None and time.monotonic() > deadline:
+                logging.info(f"Time budget exhausted, skipping {len(files) - index} remaining files")
+                break
+            processor.process_file(file)
+    finally:
+        processor.close()
+
+    combined_responses = "\n\n".join(processor.response_handler.collected_responses)
     logging.info("\n--- Combined Responses ---\n")
     logging.info(combined_responses)
     if gui:
         gui.display_message(f"Combined Responses:\n{combined_responses}")
 
+class WorkQueue:
+    """
+    Thread-safe priority queue of files waiting to be processed.
+    A file is queued at most once; re-queuing it only updates its priority (lower runs first).
+    Pending entries and the ones currently being processed are stored in a JSON file, so a
+    restarted daemon resumes where it stopped. Entries are removed by task_done().
+    """
+
+    def __init__(self, queue_file: Optional[Path] = None):
+        self.queue_file = queue_file
+        self._priorities: Dict[str, float] = {}
+        self._in_progress: Dict[str, float] = {}
+        self._heap = []
+        self._condition = Condition()
+        if queue_file and queue_file.exists():
+            try:
+                restored = json.loads(queue_file.read_text(encoding='utf-8'))
+            except ValueError as e:
+                logging.warning(f"Ignoring corrupt queue file {queue_file}: {e}")
+                restored = {}
+            if not isinstance(restored, dict) or not all(
+                    isinstance(priority, (int, float)) for priority in restored.values()):
+                logging.warning(f"Ignoring corrupt queue file {queue_file}: expected an object of priorities")
+                restored = {}
+            self.put_many({Path(path): priority for path, priority in restored.items()})
+            logging.info(f"Restored {len(self._priorities)} queued files from {queue_file}")
+
+    def put(self, file: Path, priority: float):
+        self.put_many({file: priority})
+
+    def put_many(self, priorities: Dict[Path, float]):
+        """Queues several files with a single write of the queue file."""
+        with self._condition:
+            changed = False
+            for file, priority in priorities.items():
+                key = str(file)
+                if self._priorities.get(key) == priority:
+                    continue
+                self._priorities[key] = priority
+                heapq.heappush(self._heap, (priority, key))
+                changed = True
+            if changed:
+                self._save()
+                self._condition.notify_all()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[Path]:
+        with self._condition:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while True:
+                while self._heap:
+                    priority, key = heapq.heappop(self._heap)
+                    # Skip stale heap entries whose priority was updated later
+                    if self._priorities.get(key) == priority:
+                        del self._priorities[key]
+                        self._in_progress[key] = priority
+                        return Path(key)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def task_done(self, file: Path):
+        with self._condition:
+            if self._in_progress.pop(str(file), None) is not None:
+                self._save()
+
+    def __len__(self) -> int:
+        with self._condition:
+            return len(self._priorities)
+
+    def _save(self):
+        if not self.queue_file:
+            return
+        # Write to a temporary file first so a crash never leaves a truncated queue file behind
+        entries = {**self._in_progress, **self._priorities}
+        temp_file = self.queue_file.with_name(self.queue_file.name + ".tmp")
+        temp_file.write_text(json.dumps(entries), encoding='utf-8')
+        os.replace(temp_file, self.queue_file)
+
+class PollingWatcher:
+    """
+    Detects new and modified files below the base directory by comparing modification times.
+    Polling works on every platform and needs no additional dependencies.
+    Files written by this process are wrapped in own_write() so they are not reported as changes.
+    """
+
+    def __init__(self, file_manager: FileManager, patterns: List[str]):
+        self.file_manager = file_manager
+        self.patterns = patterns
+        self._mtimes: Dict[Path, float] = {}
+        self._own_writes = set()
+        self._lock = Lock()
+
+    def snapshot(self) -> Dict[Path, float]:
+        with self._lock:
+            self._mtimes = self._scan()
+            return dict(self._mtimes)
+
+    @contextmanager
+    def own_write(self, file: Path):
+        """Suppresses change detection for a file while this process rewrites it."""
+        with self._lock:
+            self._own_writes.add(file)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._own_writes.discard(file)
+                if file.exists():
+                    self._mtimes[file] = file.stat().st_mtime
+
+    def poll(self) -> Dict[Path, float]:
+        """Returns the new and modified files with their modification times."""
+        with self._lock:
+            current = self._scan()
+            changed = {f: mtime for f, mtime in current.items()
+                       if self._mtimes.get(f) != mtime and f not in self._own_writes}
+            for file in self._own_writes:
+                # Keep the old baseline until own_write() records the final modification time
+                current.pop(file, None)
+                if file in self._mtimes:
+                    current[file] = self._mtimes[file]
+            self._mtimes = current
+            return changed
+
+    def _scan(self) -> Dict[Path, float]:
+        # Same matching as FileManager.find_files, without logging the full file list on every poll
+        mtimes = {}
+        for file in self.file_manager.base_directory.rglob("*"):
+            if any(file.match(pattern) for pattern in self.patterns):
+                try:
+                    mtimes[file] = file.stat().st_mtime
+                except FileNotFoundError:
+                    continue
+        return mtimes
+
+def queue_priorities(scheduler: Scheduler, files: List[Path]) -> Dict[Path, float]:
+    """Uses the scheduler's ordering as queue priority; files of equal rank run most recently modified first."""
+    priorities = {}
+    for item in scheduler.build_items(files):
+        priorities[item.path] = scheduler.sort_key(item) if scheduler.order != "none" else -item.last_change
+    return priorities
+
+def run_daemon(base_prompt: str, base_directory: Path, patterns: List[str], poll_interval: float = 2.0,
+               queue_file: Optional[Path] = None, initial_scan: bool = False,
+               scheduler: Optional[Scheduler] = None):
+    # The daemon never combines responses, so they are not kept for its whole lifetime
+    processor = FileProcessor(base_prompt, base_directory, collect_responses=False)
+    watcher = PollingWatcher(processor.file_manager, patterns)
+    processor.response_handler.write_guard = watcher.own_write
+    work_queue = WorkQueue(queue_file)
+    if scheduler is None:
+        scheduler = Scheduler(prompt_tokens=estimate_tokens(len(base_prompt.encode('utf-8'))))
+    stop_event = Event()
+
+    # Changes made while the daemon was not running are only picked up with initial_scan
+    known_files = watcher.snapshot()
+    if initial_scan:
+        work_queue.put_many(queue_priorities(scheduler, list(known_files)))
+
+    def worker():
+        while not stop_event.is_set():
+            try:
+                file = work_queue.get(timeout=poll_interval)
+                if file is None:
+                    continue
+                if file.exists():
+                    logging.info(f"Processing queued file {file} ({len(work_queue)} remaining)")
+                    processor.process_file(file)
+                work_queue.task_done(file)
+            except Exception as e:
+                # Keep the only worker alive, e.g. when the queue file cannot be written
+                logging.exception(f"Error in daemon worker: {e}")
+
+    worker_thread = Thread(target=worker, daemon=True)
+    worker_thread.start()
+    logging.info(f"Watching {base_directory} for {patterns} every {poll_interval}s")
+    try:
+        while True:
+            time.sleep(poll_interval)
+            changed = watcher.poll()
+            if changed:
+                work_queue.put_many(queue_priorities(scheduler, list(changed)))
+    except KeyboardInterrupt:
+        logging.info("Stopping daemon")
+    finally:
+        stop_event.set()
+        worker_thread.join()
+        processor.close()
+
 class ChatGUI:
     def __init__(self, process_callback):
+        # tkinter is only needed for the GUI, not for headless and daemon runs
+        import tkinter as tk
+        from tkinter.scrolledtext import ScrolledText
+
+        self._tk = tk
         self.root = tk.Tk()
         self.root.title("Prompt Generator")
 
@@ -174,22 +586,70 @@ class ChatGUI:
             self.display_message(f"User: {prompt}")
             self.display_message("Processing your input, please wait...")
             self.root.after(100, lambda: self.process_callback(prompt, self))
-            self.entry_field.delete(0, tk.END)
+            self.entry_field.delete(0, self._tk.END)
 
     def display_message(self, message: str):
-        self.chat_area.configure(state=tk.NORMAL)
-        self.chat_area.insert(tk.END, message + "\n")
-        self.chat_area.configure(state=tk.DISABLED)
-        self.chat_area.see(tk.END)
+        self.chat_area.configure(state=self._tk.NORMAL)
+        self.chat_area.insert(self._tk.END, message + "\n")
+        self.chat_area.configure(state=self._tk.DISABLED)
+        self.chat_area.see(self._tk.END)
 
     def run(self):
         self.root.mainloop()
 
-if __name__ == "__main__":
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Send files together with a prompt to Gemini and apply the returned Java code.")
+    parser.add_argument("--base-dir", type=Path, default=DEFAULT_BASE_DIRECTORY,
+                        help="Directory that is searched for files")
+    parser.add_argument("--pattern", dest="patterns", action="append",
+                        help=f"File pattern, can be repeated (default: {' '.join(DEFAULT_PATTERNS)})")
+    parser.add_argument("--prompt", help="Base prompt that is prepended to every file")
+    parser.add_argument("--prompt-file", type=Path, help="Read the base prompt from a file")
+    parser.add_argument("--headless", action="store_true", help="Process all files once without the GUI")
+    parser.add_argument("--daemon", action="store_true", help="Watch the base directory and process changed files")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Seconds between two scans in daemon mode")
+    parser.add_argument("--queue-file", type=Path, help="JSON file that persists the daemon work queue")
+    parser.add_argument("--initial-scan", action="store_true", help="Queue all matching files when the daemon starts")
+    parser.add_argument("--order", choices=ORDERS, default="priority",
+                        help="priority: most valuable files per token first, sjf: smallest files first, none: discovery order")
+    parser.add_argument("--token-budget", type=int, help="Maximum number of estimated prompt tokens per run")
+    parser.add_argument("--time-budget", type=float, help="Stop starting new requests after this many seconds")
+    parser.add_argument("--test-dir", type=Path, help="Test source directory; Java files without a matching *Test.java are preferred")
+    args = parser.parse_args(argv)
+
+    if args.prompt_file:
+        try:
+            args.prompt = args.prompt_file.read_text(encoding='utf-8')
+        except OSError as e:
+            parser.error(f"cannot read --prompt-file: {e}")
+    if args.daemon and (args.token_budget is not None or args.time_budget is not None):
+        parser.error("--token-budget and --time-budget apply to a single run and cannot be used with --daemon")
+    if (args.headless or args.daemon) and not args.prompt:
+        parser.error("--prompt or --prompt-file is required in headless and daemon mode")
+    if not args.patterns:
+        args.patterns = DEFAULT_PATTERNS
+    return args
+
+def main(argv: Optional[List[str]] = None):
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args = parse_args(argv)
 
-    def process_callback(prompt, gui):
-        process_files(prompt, gui)
+    def create_scheduler(prompt: str) -> Scheduler:
+        return Scheduler(args.order, args.token_budget, args.test_dir,
+                         prompt_tokens=estimate_tokens(len(prompt.encode('utf-8'))))
 
-    gui = ChatGUI(process_callback)
-    gui.run()
+    if args.daemon:
+        run_daemon(args.prompt, args.base_dir, args.patterns, args.poll_interval, args.queue_file, args.initial_scan,
+                   create_scheduler(args.prompt))
+    elif args.headless:
+        process_files(args.prompt, base_directory=args.base_dir, patterns=args.patterns,
+                      scheduler=create_scheduler(args.prompt), time_budget=args.time_budget)
+    else:
+        def process_callback(prompt, gui):
+            process_files(prompt, gui, args.base_dir, args.patterns, create_scheduler(prompt), args.time_budget)
+
+        gui = ChatGUI(process_callback)
+        gui.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Checks that importing the tools stays fast and free of side effects.
+Each module is imported in a fresh interpreter with `python -X importtime`; the check fails if
+requests, tkinter or openai get loaded at import time or the cumulative import time exceeds the budget.
+
+Usage: python bench_imports.py [--budget-ms 150] [--runs 5]
+"""
+import os
+import sys
+import argparse
+import subprocess
+
+MODULES = ["ai_dev_sync", "agents_swarm", "TestGenerator01"]
+FORBIDDEN_MODULES = ["requests", "tkinter", "openai"]
+DEFAULT_BUDGET_MS = 150.0
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import(module):
+    """
+    Imports the module in a new interpreter.
+    Returns (cumulative import time in ms, list of forbidden modules that were loaded).
+    """
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))"
+    )
+    env = dict(os.environ)
+    env.pop("API_KEY", None)  # Importing must work without credentials
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                            cwd=REPO_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr}")
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        # Format: "import time:  self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if line.startswith("import time:") and len(parts) == 3 and parts[2].strip() == module:
+            cumulative_us = int(parts[1])
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry found for {module}")
+
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return cumulative_us / 1000, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum cumulative import time per module")
+    parser.add_argument("--runs", type=int, default=5, help="Imports per module, the fastest run counts")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        timings = []
+        loaded = []
+        for _ in range(args.runs):
+            elapsed_ms, loaded = measure_import(module)
+            timings.append(elapsed_ms)
+        best_ms = min(timings)
+        status = "ok"
+        if loaded:
+            status = f"FAIL: loads {', '.join(loaded)} at import time"
+            failed = True
+        elif best_ms > args.budget_ms:
+            status = f"FAIL: exceeds budget of {args.budget_ms:.0f} ms"
+            failed = True
+        print(f"{module:<20} {best_ms:8.1f} ms  {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
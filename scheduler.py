@@ -0,0 +1,183 @@
+import os
+import math
+import time
+import logging
+import subprocess
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+CHARS_PER_TOKEN = 4  # Rough estimate for source code
+RECENCY_HALF_LIFE_DAYS = 7
+CHURN_WINDOW = "90 days ago"
+ORDERS = ["priority", "sjf", "none"]
+
+class WorkItem:
+    def __init__(self, path, tokens: int, last_change: float, churn: int, has_test: Optional[bool]):
+        self.path = path
+        self.tokens = tokens
+        self.last_change = last_change
+        self.churn = churn
+        self.has_test = has_test
+        self.priority = 0.0
+
+    def __repr__(self):
+        return (f"WorkItem({self.path}, tokens={self.tokens}, churn={self.churn}, "
+                f"has_test={self.has_test}, priority={self.priority:.3f})")
+
+class Scheduler:
+    """
+    Orders work items so that the most valuable files are processed first.
+    Each file is scored by git recency and churn and by whether a matching *Test.java exists;
+    its cost is the estimated number of prompt tokens. Files are ordered either by priority per
+    token ("priority") or by cost alone ("sjf", shortest job first) and cut off at a token budget.
+    """
+
+    def __init__(self, order: str = "priority", token_budget: Optional[int] = None,
+                 test_dir: Optional[Path] = None, prompt_tokens: int = 0):
+        if order not in ORDERS:
+            raise ValueError(f"Unknown order '{order}', expected one of {ORDERS}")
+        self.order = order
+        self.token_budget = token_budget
+        self.test_dir = Path(test_dir) if test_dir else None
+        self.prompt_tokens = prompt_tokens
+
+    def schedule(self, files: List) -> List:
+        """
+        Returns the files in processing order, without the ones that do not fit into the token budget.
+        The returned entries are the same objects that were passed in (str or Path).
+        """
+        files = list(dict.fromkeys(files))
+        if self.order == "none" and self.token_budget is None:
+            return files
+
+        items = self.build_items(files)
+        items.sort(key=self.sort_key)
+
+        scheduled = []
+        used_tokens = 0
+        for item in items:
+            if self.token_budget is not None and used_tokens + item.tokens > self.token_budget:
+                logging.info(f"Skipping {item.path}: {item.tokens} tokens exceed the remaining budget")
+                continue
+            used_tokens += item.tokens
+            scheduled.append(item)
+        logging.info(f"Scheduled {len(scheduled)} of {len(items)} files ({used_tokens} estimated tokens)")
+        for item in scheduled:
+            logging.debug(f"Scheduled {item}")
+        return [item.path for item in scheduled]
+
+    def sort_key(self, item: WorkItem) -> float:
+        """Lower keys are processed first; "none" keeps the discovery order (sorting is stable)."""
+        if self.order == "sjf":
+            return item.tokens
+        if self.order == "priority":
+            return -item.priority / item.tokens
+        return 0.0
+
+    def build_items(self, files: List) -> List[WorkItem]:
+        git_stats, git_roots, dirty_files = self._git_stats(files)
+        test_names = self._test_names()
+        now = time.time()
+
+        items = []
+        for file in files:
+            path = Path(file).resolve()
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            last_commit, churn = git_stats.get(path, (0.0, 0))
+            has_test = None
+            if test_names is not None and path.suffix == ".java":
+                has_test = f"{path.stem}Test.java" in test_names
+            # In a fresh checkout every mtime is the clone time, so it only counts for
+            # files with uncommitted changes or files outside of git
+            in_git = any(root in path.parents for root in git_roots)
+            last_change = last_commit
+            if path in dirty_files or not in_git:
+                last_change = max(last_commit, stat.st_mtime)
+            item = WorkItem(file, self.prompt_tokens + estimate_tokens(stat.st_size),
+                            last_change, churn, has_test)
+            item.priority = self._score(item, now)
+            items.append(item)
+        max_churn = max((item.churn for item in items), default=0)
+        if max_churn:
+            for item in items:
+                item.priority += math.log1p(item.churn) / math.log1p(max_churn)
+        return items
+
+    def _score(self, item: WorkItem, now: float) -> float:
+        age_days = max(now - item.last_change, 0) / 86400
+        score = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+        if item.has_test is False:
+            score += 1.0
+        return score
+
+    def _test_names(self) -> Optional[set]:
+        if not self.test_dir:
+            return None
+        names = set()
+        for root, dirs, files in os.walk(self.test_dir):
+            names.update(f for f in files if f.endswith("Test.java"))
+        return names
+
+    def _git_stats(self, files: List) -> Tuple[Dict[Path, Tuple[float, int]], set, set]:
+        """
+        Returns the last commit time and the number of commits within CHURN_WINDOW per file,
+        the repository roots and the files with uncommitted changes (modified or untracked).
+        Uses a single git log and git status call per repository; files outside of git get no stats.
+        """
+        stats: Dict[Path, Tuple[float, int]] = {}
+        directories = sorted({Path(file).resolve().parent for file in files}, key=lambda d: len(d.parts))
+        dirty = set()
+        if not directories:
+            return stats, set(), dirty
+        # Usually the common base directory already resolves the repository of every file,
+        # so git rev-parse only runs again for directories outside of a known root
+        candidates = [Path(os.path.commonpath(directories))] + directories
+        roots = set()
+        for directory in candidates:
+            if any(directory == root or root in directory.parents for root in roots):
+                continue
+            root = _git_output(["rev-parse", "--show-toplevel"], directory)
+            if root:
+                roots.add(Path(root.strip()).resolve())
+
+        for root in roots:
+            output = _git_output(["log", f"--since={CHURN_WINDOW}", "--format=@%ct", "--name-only"], root)
+            if not output:
+                continue
+            commit_time = 0.0
+            for line in output.splitlines():
+                if line.startswith("@"):
+                    commit_time = float(line[1:])
+                elif line:
+                    path = (root / line).resolve()
+                    last_commit, churn = stats.get(path, (0.0, 0))
+                    stats[path] = (max(last_commit, commit_time), churn + 1)
+
+        for root in roots:
+            output = _git_output(["status", "--porcelain", "-z", "--untracked-files=all"], root)
+            if not output:
+                continue
+            entries = iter(output.split("\0"))
+            for entry in entries:
+                if len(entry) < 4:
+                    continue
+                dirty.add((root / entry[3:]).resolve())
+                if entry[0] in "RC":
+                    next(entries, None)  # Renames and copies are followed by the original path
+        return stats, roots, dirty
+
+def estimate_tokens(size_in_bytes: int) -> int:
+    return max(1, size_in_bytes // CHARS_PER_TOKEN)
+
+def _git_output(args: List[str], cwd: Path) -> Optional[str]:
+    try:
+        result = subprocess.run(["git"] + args, cwd=cwd, capture_output=True, text=True)
+    except FileNotFoundError:
+        logging.warning("git is not installed, scheduling without recency and churn")
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout